@@ -1,27 +1,10 @@
 import os
-import re
+import sys
+import json
+import time
 import pandas as pd
-from PyPDF2 import PdfReader
-
-
-def extract_content_from_pdf(pdf_path, start_marker="Abstract", end_marker="Key Words"):
-    try:
-        reader = PdfReader(pdf_path)
-        full_text = ""
-
-        # Concatenate text from all pages
-        for page in reader.pages:
-            full_text += page.extract_text()
-
-        # Find content between start_marker and end_marker
-        match = re.search(f"{start_marker}(.*?){end_marker}", full_text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        else:
-            return None
-    except Exception as e:
-        print(f"Error processing {pdf_path}: {e}")
-        return None
+from openpyxl import Workbook, load_workbook
+from marker_extraction import extract_content_from_pdf_with_rules
 
 
 def process_pdfs_in_folder(folder_path, output_excel="output.xlsx"):
@@ -32,10 +15,11 @@ def process_pdfs_in_folder(folder_path, output_excel="output.xlsx"):
         szaml+=1
         pdf_path = os.path.join(folder_path, pdf_file)
         print(f"{szaml}. → Processing {pdf_file}...")
-        content = extract_content_from_pdf(pdf_path)
+        # Minden jelölőpár egyetlen olvasással és kereséssel
+        content, rule = extract_content_from_pdf_with_rules(pdf_path)
 
         if content:
-            data.append({"Filename": pdf_file, "Abstract_Content": content})
+            data.append({"Filename": pdf_file, "Abstract_Content": content, "Marker_Rule": rule})
         else:
             print(f"No content found in {pdf_file}.")
 
@@ -48,9 +32,165 @@ def process_pdfs_in_folder(folder_path, output_excel="output.xlsx"):
         print("No valid content found in any PDF.")
 
 
-# Define the folder containing PDFs and the output Excel file
-pdf_folder = "D:/GTG"  # Replace with the folder containing your PDFs
-output_file = "output.xlsx"
+def scan_pdfs(folder_path):
+    """Return {filename: (mtime_ns, size)} for the PDFs in folder_path."""
+    snapshot = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.pdf'):
+                stat = entry.stat()
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def load_watch_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, "r", encoding="utf-8") as f:
+        return {name: tuple(value) for name, value in json.load(f).items()}
+
+
+def save_watch_state(state_file, state):
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+class ExcelAppender:
+    """Output workbook of the folder watcher, kept open between batches.
+
+    The worksheet and its Filename -> row map are loaded once, so a batch
+    costs its own rows plus one save instead of a reload and rescan of
+    the whole output. If the file was changed by someone else since our
+    last save it is reloaded first.
+    """
+
+    def __init__(self, output_excel):
+        self.output_excel = output_excel
+        self.workbook = None
+        self.saved_mtime = None
 
-# Run the processing function
-process_pdfs_in_folder(pdf_folder, output_file)
\ No newline at end of file
+    def _load(self):
+        if os.path.exists(self.output_excel):
+            self.workbook = load_workbook(self.output_excel)
+            worksheet = self.workbook.active
+            self.header = [cell.value for cell in worksheet[1]]
+            self.row_of = {worksheet.cell(row=i, column=1).value: i for i in range(2, worksheet.max_row + 1)}
+        else:
+            self.workbook = Workbook()
+            self.header = []
+            self.row_of = {}
+
+    def append(self, rows):
+        """Append rows; rows of an already listed Filename are overwritten. Saving may raise OSError."""
+        if self.workbook is None or self._mtime() != self.saved_mtime:
+            self._load()
+        worksheet = self.workbook.active
+        # Új oszlopok (pl. Marker_Rule) felvétele egy régebbi munkafüzet fejlécébe
+        for row in rows:
+            for column in row:
+                if column not in self.header:
+                    self.header.append(column)
+                    worksheet.cell(row=1, column=len(self.header), value=column)
+        for row in rows:
+            values = [row.get(column) for column in self.header]
+            if row["Filename"] in self.row_of:
+                for column, value in enumerate(values, start=1):
+                    worksheet.cell(row=self.row_of[row["Filename"]], column=column, value=value)
+            else:
+                worksheet.append(values)
+                self.row_of[row["Filename"]] = worksheet.max_row
+        self.workbook.save(self.output_excel)
+        self.saved_mtime = self._mtime()
+
+    def _mtime(self):
+        try:
+            return os.stat(self.output_excel).st_mtime_ns
+        except OSError:
+            return None
+
+
+def watch_folder(folder_path, output_excel="output.xlsx", interval=2.0, debounce=5.0, max_batch=200):
+    """Watch folder_path and append the abstracts of new or changed PDFs to output_excel.
+
+    The folder is polled every interval seconds (mtime and size only). A
+    file is taken once its mtime and size stopped changing between two
+    polls, and ready files are collected until nothing new has arrived
+    for debounce seconds (or max_batch files are waiting), so a bulk copy
+    is processed and written in a few large batches. Processed files are
+    remembered in <output_excel>.state.json across restarts. If the
+    workbook cannot be saved (e.g. it is open in Excel), the rows are
+    kept and the save is retried on the next poll.
+    """
+    state_file = output_excel + ".state.json"
+    processed = load_watch_state(state_file)
+    appender = ExcelAppender(output_excel)
+    previous = {}
+    ready = {}
+    pending_rows = {}
+    pending = {}
+    last_change = time.monotonic()
+    print(f"Watching {folder_path} (Ctrl+C to stop)...")
+
+    def flush():
+        # A fájlok csak sikeres mentés után számítanak feldolgozottnak
+        try:
+            if pending_rows:
+                appender.append(list(pending_rows.values()))
+                print(f"{len(pending_rows)} rows saved to {output_excel}")
+        except OSError as e:
+            print(f"Error saving {output_excel}, retrying on the next poll: {e}")
+            return
+        processed.update(pending)
+        save_watch_state(state_file, processed)
+        pending_rows.clear()
+        pending.clear()
+
+    try:
+        while True:
+            snapshot = scan_pdfs(folder_path)
+            for name, signature in snapshot.items():
+                if signature in (processed.get(name), pending.get(name), ready.get(name)):
+                    continue
+                # Csak a két lekérdezés között változatlan (bemásolt) fájlokat vesszük fel
+                if previous.get(name) == signature:
+                    ready[name] = signature
+                else:
+                    ready.pop(name, None)
+                last_change = time.monotonic()
+            for name in [name for name in ready if name not in snapshot]:
+                del ready[name]
+            previous = snapshot
+
+            quiet = time.monotonic() - last_change >= debounce
+            if ready and (quiet or len(ready) >= max_batch):
+                batch = dict(sorted(ready.items())[:max_batch])
+                for szaml, (pdf_file, signature) in enumerate(batch.items(), start=1):
+                    del ready[pdf_file]
+                    pending[pdf_file] = signature
+                    print(f"{szaml}/{len(batch)}. → Processing {pdf_file}...")
+                    content, rule = extract_content_from_pdf_with_rules(os.path.join(folder_path, pdf_file))
+                    if content:
+                        pending_rows[pdf_file] = {"Filename": pdf_file, "Abstract_Content": content, "Marker_Rule": rule}
+                    else:
+                        pending_rows.pop(pdf_file, None)
+                        print(f"No content found in {pdf_file}.")
+                flush()
+            else:
+                if pending:
+                    flush()
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Watching stopped.")
+
+
+if __name__ == "__main__":
+    # Define the folder containing PDFs and the output Excel file
+    pdf_folder = "D:/GTG"  # Replace with the folder containing your PDFs
+    output_file = "output.xlsx"
+
+    if "--watch" in sys.argv:
+        # Folyamatos figyelés: csak az új vagy módosult PDF-ek kerülnek feldolgozásra
+        watch_folder(pdf_folder, output_file)
+    else:
+        # Run the processing function
+        process_pdfs_in_folder(pdf_folder, output_file)
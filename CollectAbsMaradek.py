@@ -1,27 +1,6 @@
 import os
-import re
 import pandas as pd
-from PyPDF2 import PdfReader
-
-
-def extract_content_from_pdf(pdf_path, start_marker="Abstract:", end_marker="Words:"):
-    try:
-        reader = PdfReader(pdf_path)
-        full_text = ""
-
-        # Concatenate text from all pages
-        for page in reader.pages:
-            full_text += page.extract_text()
-
-        # Find content between start_marker and end_marker
-        match = re.search(f"{start_marker}(.*?){end_marker}", full_text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        else:
-            return None
-    except Exception as e:
-        print(f"Error processing {pdf_path}: {e}")
-        return None
+from marker_extraction import extract_content_from_pdf_with_rules
 
 
 def process_pdfs_by_list(pdf_folder, file_list_path, output_excel="output.xlsx"):
@@ -42,10 +21,11 @@ def process_pdfs_by_list(pdf_folder, file_list_path, output_excel="output.xlsx")
             continue
         szaml += 1
         print(f"{szaml}. → Processing {pdf_file}...")
-        content = extract_content_from_pdf(pdf_path)
+        # Minden jelölőpár egyetlen olvasással és kereséssel
+        content, rule = extract_content_from_pdf_with_rules(pdf_path)
 
         if content:
-            data.append({"Filename": pdf_file, "Abstract_Content": content})
+            data.append({"Filename": pdf_file, "Abstract_Content": content, "Marker_Rule": rule})
         else:
             print(f"No content found in {pdf_file}.")
 
@@ -58,10 +38,11 @@ def process_pdfs_by_list(pdf_folder, file_list_path, output_excel="output.xlsx")
         print("No valid content found in any PDF.")
 
 
-# Define paths
-pdf_folder = "D:/GTG_MARAD"  # Replace with the folder containing your PDFs
-file_list = "d:/maradek.txt"
-output_file = "output.xlsx"
+if __name__ == "__main__":
+    # Define paths
+    pdf_folder = "D:/GTG_MARAD"  # Replace with the folder containing your PDFs
+    file_list = "d:/maradek.txt"
+    output_file = "output.xlsx"
 
-# Run the processing function
-process_pdfs_by_list(pdf_folder, file_list, output_file)
\ No newline at end of file
+    # Run the processing function
+    process_pdfs_by_list(pdf_folder, file_list, output_file)
@@ -0,0 +1,206 @@
+import os
+import sys
+import getpass
+import secrets
+import argparse
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+# Cím: alapértelmezésben Unix socket a felhasználó saját könyvtárában (Windowson named pipe).
+# Sima TCP ("host:port") csak akkor, ha kifejezetten megadják.
+ADDRESS_ENV = "ABSTRACT_SERVICE_ADDRESS"
+AUTHKEY_ENV = "ABSTRACT_SERVICE_AUTHKEY"
+SERVICE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "abstract-analysis")
+
+# A szolgáltatáson keresztül hívható TextAnalyzer metódusok
+ALLOWED_OPS = (
+    "clean_text",
+    "remove_stopwords",
+    "process_text",
+    "get_keywords",
+    "get_sentiment",
+    "get_readability_score",
+    "get_entities",
+    "get_pos_stats",
+)
+
+_local_analyzer = None
+
+
+def _service_dir():
+    """Directory for the socket and the key, readable only by the current user."""
+    os.makedirs(SERVICE_DIR, mode=0o700, exist_ok=True)
+    if os.name == "posix":
+        os.chmod(SERVICE_DIR, 0o700)
+    return SERVICE_DIR
+
+
+def default_address():
+    address = os.environ.get(ADDRESS_ENV)
+    if address:
+        return address
+    if sys.platform == "win32":
+        return rf"\\.\pipe\abstract-analysis-{getpass.getuser()}"
+    return os.path.join(_service_dir(), "analysis.sock")
+
+
+def _authkey():
+    """Per-user random key, created on first use in a file only the user can read.
+
+    The connection pickles requests and responses, so the key is what
+    keeps other local users from talking to (or impersonating) the
+    service.
+    """
+    key = os.environ.get(AUTHKEY_ENV)
+    if key:
+        return key.encode("utf-8")
+    path = os.path.join(_service_dir(), "authkey")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as file:
+            return file.read().strip()
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as file:
+        file.write(key)
+    return key
+
+
+def _parse_address(address):
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def local_stopwords():
+    """English stop words straight from NLTK, without loading the analyzer."""
+    import nltk
+    from nltk.corpus import stopwords
+    try:
+        words = stopwords.words('english')
+    except LookupError:
+        # Friss gépen a korpusz még nincs letöltve
+        nltk.download('stopwords')
+        words = stopwords.words('english')
+    return sorted(set(words))
+
+
+def get_local_analyzer():
+    """Return a process-wide TextAnalyzer, created on first use."""
+    global _local_analyzer
+    if _local_analyzer is None:
+        from tobbestEgyesbe import TextAnalyzer
+        _local_analyzer = TextAnalyzer()
+    return _local_analyzer
+
+
+def _run_op(analyzer, op, texts, kwargs):
+    if op == "stopwords":
+        return local_stopwords()
+    if op not in ALLOWED_OPS:
+        raise ValueError(f"Unknown operation: {op}")
+    method = getattr(analyzer, op)
+    return [method(text, **kwargs) for text in texts]
+
+
+def _request(address, request):
+    """Send one request to the service; None if it is not reachable."""
+    try:
+        with Client(_parse_address(address or default_address()), authkey=_authkey()) as conn:
+            conn.send(request)
+            return conn.recv()
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+
+def analyze(op, texts, address=None, **kwargs):
+    """Run a TextAnalyzer method on a batch of texts.
+
+    Uses the running analysis service if there is one, otherwise falls
+    back to an in-process analyzer.
+    """
+    texts = list(texts)
+    response = _request(address, {"op": op, "texts": texts, "kwargs": kwargs})
+    if response is None:
+        if op == "stopwords":
+            return local_stopwords()
+        return _run_op(get_local_analyzer(), op, texts, kwargs)
+    if not response["ok"]:
+        raise RuntimeError(f"Analysis service error: {response['error']}")
+    return response["results"]
+
+
+def get_stopwords(address=None):
+    """English stop word list, from the service if it is running."""
+    return analyze("stopwords", [], address)
+
+
+def is_running(address=None):
+    response = _request(address, {"op": "ping"})
+    return bool(response and response.get("ok"))
+
+
+def _handle_connection(conn, analyzer, lock):
+    with conn:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request.get("op") == "ping":
+            conn.send({"ok": True, "results": []})
+            return
+        try:
+            # A TextAnalyzer (NLTK, TextBlob) nem szálbiztos, ezért a kéréseket sorban szolgáljuk ki
+            with lock:
+                results = _run_op(analyzer, request["op"], request.get("texts", []), request.get("kwargs", {}))
+            conn.send({"ok": True, "results": results})
+        except Exception as e:
+            conn.send({"ok": False, "error": str(e)})
+
+
+def serve(address=None):
+    """Keep a warm TextAnalyzer and answer batched requests until interrupted."""
+    analyzer = get_local_analyzer()
+    # Bemelegítés: WordNet, TextBlob és a taggerek betöltése indításkor
+    analyzer.process_text("warming up the models")
+    analyzer.get_sentiment("warming up the models")
+    analyzer.get_readability_score("Warming up the models.")
+    lock = threading.Lock()
+
+    address = address or default_address()
+    parsed = _parse_address(address)
+    # Egy korábbi, nem tisztán leállt példány itt hagyhatta a socket fájlt
+    if isinstance(parsed, str) and os.path.exists(parsed) and not is_running(address):
+        os.unlink(parsed)
+    with Listener(parsed, authkey=_authkey()) as listener:
+        print(f"Analysis service listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                print(f"Rejected connection: {e}")
+                continue
+            threading.Thread(target=_handle_connection, args=(conn, analyzer, lock), daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm local TextAnalyzer service.")
+    parser.add_argument("command", choices=("serve", "status") + ALLOWED_OPS,
+                        help="'serve' starts the service; an operation name processes stdin line by line")
+    parser.add_argument("--address", default=None,
+                        help="Unix socket path or named pipe; 'host:port' opts in to plain TCP "
+                             f"(default: ${ADDRESS_ENV} or a socket in {SERVICE_DIR})")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.address)
+    elif args.command == "status":
+        print("running" if is_running(args.address) else "not running")
+    else:
+        lines = [line.rstrip("\n") for line in sys.stdin]
+        for result in analyze(args.command, lines, args.address):
+            print(result)
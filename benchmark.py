@@ -0,0 +1,343 @@
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from tobbestEgyesbe import TextAnalyzer, extract_abstract_from_pdf
+from nlp_backends import get_nlp_backend
+from token_corpus import TokenCorpus
+
+# Alapértelmezett eredményfájl: minden futás egy JSON sor, így a futások összevethetők
+RESULTS_FILE = "benchmark_results.jsonl"
+
+# Szókészlet a szintetikus szövegekhez (csak ASCII, hogy a Helvetica betűkészlet elég legyen)
+VOCABULARY = (
+    "analysis model data system method result study performance network learning "
+    "process value research design approach structure energy control measurement "
+    "algorithm evaluation experiment sample material signal quality efficiency "
+    "development application framework simulation optimization parameter theory "
+    "environment management strategy technology information knowledge behaviour "
+    "university student teacher education market economy policy society health "
+    "the of and in to a is for on with by as that are from this be at an which"
+).split()
+
+LINE_WIDTH = 90
+LINES_PER_PAGE = 50
+
+
+def _sentence(rng, min_words=6, max_words=18):
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng, sentences):
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+
+def _wrap(text, width=LINE_WIDTH):
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _escape_pdf_text(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, pages):
+    """Write a minimal text-only PDF; pages is a list of lists of text lines."""
+    objects = []
+    page_ids = []
+    # 1: katalógus, 2: oldalfa, 3: betűkészlet, utána oldalanként oldal + tartalom
+    for index, lines in enumerate(pages):
+        page_id = 4 + index * 2
+        content_id = page_id + 1
+        page_ids.append(page_id)
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td\n"
+        stream += "".join(f"({_escape_pdf_text(line)}) Tj T*\n" for line in lines)
+        stream += "ET"
+        data = stream.encode("latin-1")
+        objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")))
+        objects.append((content_id, b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")),
+        (3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+    ] + objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n" % (len(objects) + 1)
+    out += b"0000000000 65535 f \n"
+    for obj_id in range(1, len(objects) + 1):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def _paginate(lines, lines_per_page=LINES_PER_PAGE):
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+
+def generate_short_paper(path, rng):
+    """Synthetic conference paper with "Abstract ... Key Words" markers."""
+    lines = _wrap(_sentence(rng, 5, 10).rstrip("."))
+    lines.append("")
+    lines.append("Abstract")
+    lines += _wrap(_paragraph(rng, rng.randint(4, 9)))
+    keywords = ", ".join(rng.sample(VOCABULARY[:60], 5))
+    lines.append(f"Key Words: {keywords}")
+    lines.append("")
+    for _ in range(rng.randint(6, 12)):
+        lines += _wrap(_paragraph(rng, rng.randint(4, 8)))
+        lines.append("")
+    write_pdf(path, _paginate(lines))
+
+
+def generate_long_document(path, rng, pages=200):
+    """Synthetic dissertation-sized document."""
+    lines = ["Doctoral dissertation", "", "Abstract"]
+    lines += _wrap(_paragraph(rng, 12))
+    lines.append("Key Words: " + ", ".join(rng.sample(VOCABULARY[:60], 6)))
+    while len(lines) < pages * LINES_PER_PAGE:
+        lines += _wrap(_paragraph(rng, rng.randint(5, 10)))
+        lines.append("")
+    write_pdf(path, _paginate(lines[:pages * LINES_PER_PAGE]))
+
+
+def generate_corpus(folder, n_short, n_long=0, long_pages=200, seed=42):
+    """Generate a reproducible synthetic PDF corpus and return the file paths."""
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    files = []
+    for i in range(n_short):
+        path = os.path.join(folder, f"paper_{i:05d}.pdf")
+        generate_short_paper(path, rng)
+        files.append(path)
+    for i in range(n_long):
+        path = os.path.join(folder, f"dissertation_{i:03d}.pdf")
+        generate_long_document(path, rng, pages=long_pages)
+        files.append(path)
+    return files
+
+
+def _timed(func, repeat, setup=None):
+    """Best wall time of func over repeat runs; setup runs untimed before each run."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _count_words(texts):
+    # Ugyanaz a logika, mint a szoszamlalo.count_words_in_excel-ben
+    return TokenCorpus.from_texts(texts).most_common(550)
+
+
+def _write_columnar(df, folder):
+    path = os.path.join(folder, "bench.parquet")
+    try:
+        df.to_parquet(path, index=False)
+    except ImportError:
+        path = os.path.join(folder, "bench.csv")
+        df.to_csv(path, index=False)
+
+
+def benchmark_corpus(files, work_dir, repeat=1):
+    """Time every pipeline stage on the given PDF files."""
+    analyzer = TextAnalyzer()
+    timings = {}
+
+    timings["extraction"], abstracts = _timed(
+        lambda: [extract_abstract_from_pdf(f) for f in files], repeat)
+    timings["normalization"], no_stopwords = _timed(
+        lambda: [analyzer.remove_stopwords(analyzer.clean_text(a)) for a in abstracts], repeat)
+    timings["lemmatization"], singularized = _timed(
+        lambda: [analyzer.process_text(t) for t in no_stopwords], repeat)
+    timings["sentiment"], _ = _timed(
+        lambda: [analyzer.get_sentiment(a) for a in abstracts], repeat)
+    timings["readability"], _ = _timed(
+        lambda: [analyzer.get_readability_score(a) for a in abstracts], repeat)
+    # A (csak memóriában tartott) pontszám gyorsítótárat minden ismétlés előtt ürítjük, hogy ne torzítson
+    timings["scores_batch"], _ = _timed(
+        lambda: analyzer.score_texts(abstracts), repeat, setup=analyzer.score_cache.memory.clear)
+    # A compute_columns által használt kötegelt út
+    timings["keywords"], _ = _timed(
+        lambda: analyzer.get_keywords_batch(singularized), repeat)
+    timings["tfidf_keywords"], _ = _timed(
+        lambda: analyzer.get_tfidf_keywords(singularized), repeat)
+    timings["word_count"], _ = _timed(lambda: _count_words(abstracts), repeat)
+
+    df = pd.DataFrame({
+        "File_Name": [os.path.basename(f) for f in files],
+        "Original_Abstract": abstracts,
+        "Singularized": singularized,
+    })
+    timings["excel_write"], _ = _timed(
+        lambda: df.to_excel(os.path.join(work_dir, "bench.xlsx"), index=False), repeat)
+    timings["columnar_write"], _ = _timed(lambda: _write_columnar(df, work_dir), repeat)
+    return timings
+
+
+def run_benchmarks(sizes, n_long=1, long_pages=200, repeat=1, seed=42, results_file=RESULTS_FILE):
+    """Run the suite for each corpus size and append the results to results_file."""
+    run = {
+        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "kind": "pipeline",
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            corpus_dir = os.path.join(work_dir, f"corpus_{size}")
+            files = generate_corpus(corpus_dir, size, seed=seed)
+            print(f"→ Short papers: {size}")
+            run["results"][f"short_{size}"] = benchmark_corpus(files, work_dir, repeat)
+        if n_long:
+            corpus_dir = os.path.join(work_dir, "corpus_long")
+            files = generate_corpus(corpus_dir, 0, n_long, long_pages, seed=seed)
+            print(f"→ Long documents: {n_long} x {long_pages} pages")
+            run["results"][f"long_{n_long}x{long_pages}"] = benchmark_corpus(files, work_dir, repeat)
+
+    for corpus, timings in run["results"].items():
+        print(f"\n{corpus}")
+        for stage, seconds in timings.items():
+            print(f"  {stage:<16} {seconds:9.4f} s")
+
+    with open(results_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    print(f"\nResults appended to {results_file}")
+    return run
+
+
+def benchmark_nlp_backends(size=100, backends=('nltk', 'spacy'), repeat=1, seed=42, results_file=RESULTS_FILE):
+    """Compare entity/POS extraction time of the NLP backends on the same synthetic abstracts."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        abstracts = [extract_abstract_from_pdf(f) for f in generate_corpus(work_dir, size, seed=seed)]
+
+    run = {
+        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "kind": "nlp",
+        "results": {},
+    }
+    for name in backends:
+        try:
+            backend = get_nlp_backend(name)
+        except (ImportError, OSError) as e:
+            print(f"Skipping {name} backend: {e}")
+            continue
+        seconds, analyzed = _timed(lambda: backend.analyze(abstracts), repeat)
+        entity_count = sum(len(values) for entities, _ in analyzed for values in entities.values())
+        run["results"][f"nlp_{name}_{size}"] = {"entities_pos": seconds}
+        print(f"  {name:<8} {seconds:9.4f} s  ({entity_count} entities)")
+
+    with open(results_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    return run
+
+
+def load_runs(results_file=RESULTS_FILE):
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_runs(baseline, current, threshold=0.10):
+    """Return (corpus, stage, old, new) tuples where current is slower than baseline by more than threshold."""
+    regressions = []
+    for corpus, timings in current["results"].items():
+        old_timings = baseline["results"].get(corpus, {})
+        for stage, new in timings.items():
+            old = old_timings.get(stage)
+            if old and new > old * (1 + threshold):
+                regressions.append((corpus, stage, old, new))
+    return regressions
+
+
+def find_baseline(runs, current):
+    """Latest run before current of the same kind (pipeline or nlp) over the same corpora."""
+    for run in reversed(runs):
+        if run.get("kind", "pipeline") == current.get("kind", "pipeline") and run["results"].keys() == current["results"].keys():
+            return run
+    return None
+
+
+def report_regressions(results_file=RESULTS_FILE, threshold=0.10):
+    """Compare the latest run of each kind with its baseline and print the regressions."""
+    runs = load_runs(results_file)
+    latest = {}
+    for index, run in enumerate(runs):
+        latest[run.get("kind", "pipeline")] = index
+    if not latest:
+        print("No stored runs.")
+        return []
+    regressions = []
+    for kind, index in latest.items():
+        current = runs[index]
+        baseline = find_baseline(runs[:index], current)
+        if baseline is None:
+            print(f"No earlier {kind} run over the same corpora to compare {current['timestamp']} with.")
+            continue
+        print(f"Comparing {kind} run {current['timestamp']} against {baseline['timestamp']}")
+        found = compare_runs(baseline, current, threshold)
+        if not found:
+            print("No regressions found.")
+        for corpus, stage, old, new in found:
+            print(f"  REGRESSION {corpus}/{stage}: {old:.4f} s → {new:.4f} s ({(new / old - 1) * 100:+.1f}%)")
+        regressions.extend(found)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the abstract processing pipeline on a synthetic PDF corpus.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="Number of short papers per corpus")
+    parser.add_argument("--long", type=int, default=1, help="Number of dissertation-sized documents")
+    parser.add_argument("--long-pages", type=int, default=200, help="Pages per long document")
+    parser.add_argument("--repeat", type=int, default=1, help="Repetitions per stage (best time is kept)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--compare", action="store_true", help="Compare the latest stored run of each kind with the previous comparable one")
+    parser.add_argument("--nlp", action="store_true", help="Compare the NLTK and spaCy NER/POS backends")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as regression")
+    args = parser.parse_args()
+
+    if args.nlp:
+        benchmark_nlp_backends(args.sizes[0], repeat=args.repeat, seed=args.seed, results_file=args.results)
+    elif not args.compare:
+        run_benchmarks(args.sizes, args.long, args.long_pages, args.repeat, args.seed, args.results)
+    report_regressions(args.results, args.threshold)
@@ -0,0 +1,103 @@
+import re
+import zlib
+import numpy as np
+
+# Mersenne-prím a permutációkhoz (a*x + b) mod p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def shingles(text, size=3):
+    """Word n-gram shingles of an already cleaned text."""
+    words = re.findall(r'\w+', text.lower()) if isinstance(text, str) else []
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _permutations(num_perm, seed):
+    rng = np.random.RandomState(seed)
+    # a < 2^31 és x < 2^32, így a*x + b nem csordul túl uint64-ben
+    a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+    b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm=128, shingle_size=3, seed=1):
+    """Return a (len(texts), num_perm) uint64 MinHash signature matrix.
+
+    Documents without shingles get an all-MAX_HASH row.
+    """
+    a, b = _permutations(num_perm, seed)
+    signatures = np.full((len(texts), num_perm), MAX_HASH, dtype=np.uint64)
+    for i, text in enumerate(texts):
+        doc_shingles = shingles(text, shingle_size)
+        if not doc_shingles:
+            continue
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in doc_shingles),
+                             dtype=np.uint64, count=len(doc_shingles))
+        permuted = (np.outer(hashes, a) + b) % MERSENNE_PRIME & MAX_HASH
+        signatures[i] = permuted.min(axis=0)
+    return signatures
+
+
+def choose_bands(num_perm, threshold):
+    """Pick (bands, rows) with bands*rows == num_perm whose S-curve midpoint is closest to threshold."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def lsh_candidate_pairs(signatures, bands, rows):
+    """Bucket each band of the signatures and return colliding (i, j) candidate pairs, i < j."""
+    empty = np.all(signatures == MAX_HASH, axis=1)
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        band_slice = signatures[:, band * rows:(band + 1) * rows]
+        for i in np.flatnonzero(~empty):
+            buckets.setdefault(band_slice[i].tobytes(), []).append(i)
+        # Egy vödör összes párját ellenőrizzük: ha csak az első taghoz párosítanánk, egy véletlen
+        # ütközés elrejthetné a valódi duplikátumokat. A vödrök kicsik, így ez olcsó marad.
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((int(members[x]), int(members[y])))
+    return pairs
+
+
+def find_duplicate_clusters(texts, threshold=0.8, num_perm=128, shingle_size=3, seed=1):
+    """Cluster near-duplicate texts and return one cluster id per text.
+
+    Candidate pairs come from MinHash LSH and are kept only if their
+    estimated Jaccard similarity reaches threshold. Cluster ids are
+    numbered from 0 in order of first appearance; unique texts get
+    their own id.
+    """
+    texts = list(texts)
+    signatures = minhash_signatures(texts, num_perm, shingle_size, seed)
+    bands, rows = choose_bands(num_perm, threshold)
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in lsh_candidate_pairs(signatures, bands, rows):
+        similarity = np.mean(signatures[i] == signatures[j])
+        if similarity >= threshold:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    cluster_ids = {}
+    return [cluster_ids.setdefault(find(i), len(cluster_ids)) for i in range(len(texts))]
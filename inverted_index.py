@@ -0,0 +1,320 @@
+import os
+import re
+import json
+from collections import defaultdict
+from tobbestEgyesbe import TextAnalyzer
+
+DOCS_FILE = "docs.txt"
+DELETED_FILE = "deleted.json"
+SEGMENT_PREFIX = "seg_"
+
+QUERY_TOKEN = re.compile(r'"[^"]*"|\(|\)|[^\s()"]+')
+
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varints(data):
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def encode_postings(postings):
+    """Encode {doc_id: [positions]} as varints: doc-id gaps, then tf and position gaps per doc."""
+    out = bytearray()
+    previous_doc = 0
+    for doc_id in sorted(postings):
+        positions = postings[doc_id]
+        _encode_varint(doc_id - previous_doc, out)
+        _encode_varint(len(positions), out)
+        previous_position = 0
+        for position in positions:
+            _encode_varint(position - previous_position, out)
+            previous_position = position
+        previous_doc = doc_id
+    return bytes(out)
+
+
+def decode_postings(data):
+    values = _decode_varints(data)
+    postings = {}
+    i = 0
+    doc_id = 0
+    while i < len(values):
+        doc_id += values[i]
+        tf = values[i + 1]
+        i += 2
+        positions = []
+        position = 0
+        for gap in values[i:i + tf]:
+            position += gap
+            positions.append(position)
+        i += tf
+        postings[doc_id] = positions
+    return postings
+
+
+class InvertedIndex:
+    """On-disk positional inverted index over Singularized tokens.
+
+    Every flush writes an immutable segment (a varint-encoded postings
+    file plus a JSON lexicon of term -> offset, length, document
+    frequency), so new PDFs are indexed without rewriting older data.
+    Re-adding a file name replaces its earlier version.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.analyzer = None
+        os.makedirs(index_dir, exist_ok=True)
+
+        self.doc_names = []
+        docs_path = os.path.join(index_dir, DOCS_FILE)
+        if os.path.exists(docs_path):
+            with open(docs_path, "r", encoding="utf-8") as f:
+                self.doc_names = [line.rstrip("\n") for line in f]
+        self.deleted = set()
+        deleted_path = os.path.join(index_dir, DELETED_FILE)
+        if os.path.exists(deleted_path):
+            with open(deleted_path, "r", encoding="utf-8") as f:
+                self.deleted = set(json.load(f))
+        self.name_to_id = {name: doc_id for doc_id, name in enumerate(self.doc_names) if doc_id not in self.deleted}
+
+        self.segments = []
+        for filename in sorted(os.listdir(index_dir)):
+            if filename.startswith(SEGMENT_PREFIX) and filename.endswith(".lex"):
+                self._load_segment(filename[:-len(".lex")])
+
+        self._pending = {}
+        self._pending_names = []
+
+    def _load_segment(self, name):
+        with open(os.path.join(self.index_dir, name + ".lex"), "r", encoding="utf-8") as f:
+            lexicon = json.load(f)
+        self.segments.append((name, lexicon))
+
+    def _read_postings(self, segment, term):
+        name, lexicon = segment
+        entry = lexicon.get(term)
+        if entry is None:
+            return {}
+        offset, length, _ = entry
+        with open(os.path.join(self.index_dir, name + ".post"), "rb") as f:
+            f.seek(offset)
+            return decode_postings(f.read(length))
+
+    def _normalize(self, text):
+        """Query text -> index terms, through the same pipeline as the Singularized column.
+
+        clean_text splits "network-model" into two terms, and stop words
+        are dropped just as they were before the positions were indexed.
+        """
+        if self.analyzer is None:
+            self.analyzer = TextAnalyzer()
+        return self.analyzer.process_text(text).split()
+
+    # Indexelés
+
+    def add_document(self, name, text, processed=True):
+        """Queue a document for the next flush; text is a Singularized string unless processed=False."""
+        if not processed:
+            if self.analyzer is None:
+                self.analyzer = TextAnalyzer()
+            text = self.analyzer.process_text(text)
+        old_id = self.name_to_id.get(name)
+        if old_id is not None:
+            self.deleted.add(old_id)
+            self._pending.pop(old_id, None)
+
+        doc_id = len(self.doc_names)
+        self.doc_names.append(name)
+        self._pending_names.append(name)
+        self.name_to_id[name] = doc_id
+        self._pending[doc_id] = text.split() if isinstance(text, str) else []
+
+    def add_documents(self, names, texts, processed=True):
+        for name, text in zip(names, texts):
+            self.add_document(name, text, processed)
+        self.flush()
+
+    def flush(self):
+        """Write queued documents as a new segment."""
+        if not self._pending_names:
+            return
+        inverted = defaultdict(dict)
+        for doc_id, tokens in self._pending.items():
+            for position, token in enumerate(tokens):
+                inverted[token].setdefault(doc_id, []).append(position)
+        self._write_segment(inverted)
+
+        with open(os.path.join(self.index_dir, DOCS_FILE), "a", encoding="utf-8") as f:
+            f.writelines(f"{name}\n" for name in self._pending_names)
+        self._save_deleted()
+        self._pending = {}
+        self._pending_names = []
+
+    def _next_segment_number(self):
+        return max((int(name[len(SEGMENT_PREFIX):]) for name, _ in self.segments), default=0) + 1
+
+    def _write_segment(self, inverted, number=None):
+        if number is None:
+            number = self._next_segment_number()
+        name = f"{SEGMENT_PREFIX}{number:06d}"
+        lexicon = {}
+        with open(os.path.join(self.index_dir, name + ".post"), "wb") as f:
+            offset = 0
+            for term in sorted(inverted):
+                data = encode_postings(inverted[term])
+                f.write(data)
+                lexicon[term] = [offset, len(data), len(inverted[term])]
+                offset += len(data)
+        # A lexikon kerül utoljára lemezre, így egy félbeszakadt írás nem látszik szegmensnek
+        with open(os.path.join(self.index_dir, name + ".lex"), "w", encoding="utf-8") as f:
+            json.dump(lexicon, f)
+        self.segments.append((name, lexicon))
+
+    def _save_deleted(self):
+        with open(os.path.join(self.index_dir, DELETED_FILE), "w", encoding="utf-8") as f:
+            json.dump(sorted(self.deleted), f)
+
+    def merge_segments(self):
+        """Compact all segments into one and drop postings of replaced documents."""
+        self.flush()
+        if len(self.segments) < 2 and not self.deleted:
+            return
+        terms = set()
+        for _, lexicon in self.segments:
+            terms.update(lexicon)
+        inverted = {}
+        for term in terms:
+            postings = self.postings(term)
+            if postings:
+                inverted[term] = postings
+        number = self._next_segment_number()
+        old_segments = self.segments
+        self.segments = []
+        self._write_segment(inverted, number)
+        for name, _ in old_segments:
+            os.remove(os.path.join(self.index_dir, name + ".lex"))
+            os.remove(os.path.join(self.index_dir, name + ".post"))
+
+    # Lekérdezés
+
+    def postings(self, term):
+        """Return {doc_id: [positions]} for a term across all segments, without replaced documents."""
+        merged = {}
+        for segment in self.segments:
+            for doc_id, positions in self._read_postings(segment, term).items():
+                if doc_id not in self.deleted:
+                    merged[doc_id] = positions
+        return merged
+
+    def document_frequency(self, term, normalize=True):
+        if normalize:
+            terms = self._normalize(term)
+            if len(terms) != 1:
+                return len(self._phrase_docs(terms)) if terms else 0
+            term = terms[0]
+        if not self.deleted:
+            return sum(lexicon[term][2] for _, lexicon in self.segments if term in lexicon)
+        return len(self.postings(term))
+
+    def _live_docs(self):
+        return set(range(len(self.doc_names))) - self.deleted
+
+    def _phrase_docs(self, terms):
+        """Documents containing the normalized terms at consecutive positions."""
+        if not terms:
+            return set()
+        term_postings = [self.postings(term) for term in terms]
+        candidates = set(term_postings[0])
+        for postings in term_postings[1:]:
+            candidates &= set(postings)
+        matches = set()
+        for doc_id in candidates:
+            position_sets = [set(postings[doc_id]) for postings in term_postings]
+            if any(all(start + i in position_sets[i] for i in range(1, len(terms)))
+                   for start in term_postings[0][doc_id]):
+                matches.add(doc_id)
+        return matches
+
+    def _matching_docs(self, text):
+        terms = self._normalize(text)
+        # Csak stop wordökből álló kifejezés nem szűr (a stop wordök nincsenek az indexben)
+        if not terms:
+            return self._live_docs()
+        if len(terms) == 1:
+            return set(self.postings(terms[0]))
+        # A stop wordök nélküli indexben a kifejezés szavai egymást követő pozíciókon állnak
+        return self._phrase_docs(terms)
+
+    def search(self, query):
+        """Evaluate a boolean query and return the matching file names.
+
+        Supports AND, OR, NOT, parentheses and "quoted phrases"; adjacent
+        terms without an operator are combined with AND.
+        """
+        self.flush()
+        tokens = QUERY_TOKEN.findall(query)
+        position = 0
+
+        def peek():
+            return tokens[position] if position < len(tokens) else None
+
+        def parse_or():
+            nonlocal position
+            result = parse_and()
+            while peek() == "OR":
+                position += 1
+                result = result | parse_and()
+            return result
+
+        def parse_and():
+            nonlocal position
+            result = parse_not()
+            while peek() is not None and peek() not in ("OR", ")"):
+                if peek() == "AND":
+                    position += 1
+                result = result & parse_not()
+            return result
+
+        def parse_not():
+            nonlocal position
+            if peek() == "NOT":
+                position += 1
+                return self._live_docs() - parse_not()
+            return parse_atom()
+
+        def parse_atom():
+            nonlocal position
+            token = peek()
+            if token is None:
+                raise ValueError(f"Unexpected end of query: {query!r}")
+            position += 1
+            if token == "(":
+                result = parse_or()
+                if peek() != ")":
+                    raise ValueError(f"Missing closing parenthesis in query: {query!r}")
+                position += 1
+                return result
+            return self._matching_docs(token.strip('"'))
+
+        doc_ids = parse_or()
+        if peek() is not None:
+            raise ValueError(f"Unexpected token {peek()!r} in query: {query!r}")
+        return [self.doc_names[doc_id] for doc_id in sorted(doc_ids)]
+
+    def __len__(self):
+        return len(self.name_to_id)
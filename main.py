@@ -1,10 +1,12 @@
 import sys
 import os
+import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QLineEdit, 
                             QTextEdit, QFileDialog, QMessageBox, QProgressBar,
-                            QTabWidget, QListWidget, QFrame)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+                            QTabWidget, QListWidget, QListView, QFrame,
+                            QAbstractItemView)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QAbstractListModel, QModelIndex
 from PyQt6.QtGui import QFont, QIcon, QDragEnterEvent, QDropEvent, QColor, QPalette
 from tobbestEgyesbe import process_pdfs, process_urls, TextAnalyzer
 
@@ -42,13 +44,119 @@ class URLProcessorThread(QThread):
             self.progress.emit(f"Error: {str(e)}")
             self.finished.emit(False)
 
-class DragDropListWidget(QListWidget):
+class PathListModel(QAbstractListModel):
+    """List model over a plain list of paths with O(1) duplicate checks."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._keys = set()
+        
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._paths[index.row()]
+        return None
+        
+    def add_paths(self, paths):
+        """Append the paths that are not in the list yet; returns how many were added."""
+        new_paths = []
+        for path in paths:
+            key = self._key(path)
+            if key not in self._keys:
+                self._keys.add(key)
+                new_paths.append(path)
+        if new_paths:
+            first = len(self._paths)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+            self._paths.extend(new_paths)
+            self.endInsertRows()
+        return len(new_paths)
+        
+    def remove_rows(self, rows):
+        if not rows:
+            return
+        removed = set(rows)
+        self.beginResetModel()
+        self._paths = [path for row, path in enumerate(self._paths) if row not in removed]
+        self._keys = {self._key(path) for path in self._paths}
+        self.endResetModel()
+        
+    def clear(self):
+        self.beginResetModel()
+        self._paths = []
+        self._keys = set()
+        self.endResetModel()
+        
+    def paths(self):
+        return list(self._paths)
+
+class FolderScanThread(QThread):
+    """Recursively collects PDF paths off the UI thread and reports them in batches."""
+    found = pyqtSignal(list)
+    scan_finished = pyqtSignal(int)
+    
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.2
+    
+    def __init__(self, folders):
+        super().__init__()
+        self.folders = folders
+        
+    def run(self):
+        batch = []
+        total = 0
+        last_emit = time.monotonic()
+        stack = list(self.folders)
+        while stack and not self.isInterruptionRequested():
+            folder = stack.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if self.isInterruptionRequested():
+                            break
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith('.pdf'):
+                            batch.append(entry.path)
+                        # Egyetlen hatalmas mappa közben is folyamatosan jelentünk
+                        if len(batch) >= self.BATCH_SIZE or (batch and time.monotonic() - last_emit >= self.BATCH_INTERVAL):
+                            total += len(batch)
+                            self.found.emit(batch)
+                            batch = []
+                            last_emit = time.monotonic()
+            except OSError as e:
+                print(f"Error scanning {folder}: {e}")
+        if batch:
+            total += len(batch)
+            self.found.emit(batch)
+        self.scan_finished.emit(total)
+
+class DragDropListView(QListView):
+    """Virtualized PDF list: accepts dropped PDF files and (recursively) folders."""
+    scan_started = pyqtSignal()
+    scan_finished = pyqtSignal(int)
+    
     def __init__(self):
         super().__init__()
+        self.path_model = PathListModel(self)
+        self.setModel(self.path_model)
         self.setAcceptDrops(True)
         self.setDragEnabled(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        # Egyforma sormagasság és kötegelt elrendezés: csak a látható sorok kerülnek kirajzolásra
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.scan_threads = []
         self.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #F5F7FA;
                 border: 2px dashed #C1C7D0;
                 border-radius: 8px;
@@ -56,7 +164,7 @@ class DragDropListWidget(QListWidget):
                 font-size: 14px;
                 color: #5E6C84;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
                 border-bottom: 1px solid #DFE1E6;
             }
@@ -66,14 +174,46 @@ class DragDropListWidget(QListWidget):
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
             
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+            
     def dropEvent(self, event: QDropEvent):
-        files = [url.toLocalFile() for url in event.mimeData().urls()]
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                self.addItem(file)
+        folders, pdfs, invalid = [], [], []
+        for url in event.mimeData().urls():
+            file = url.toLocalFile()
+            if os.path.isdir(file):
+                folders.append(file)
+            elif file.lower().endswith('.pdf'):
+                pdfs.append(file)
             else:
-                QMessageBox.warning(self, "Invalid File", 
-                                  f"{file} is not a PDF file.")
+                invalid.append(file)
+        self.path_model.add_paths(pdfs)
+        if folders:
+            self.scan_folders(folders)
+        if invalid:
+            QMessageBox.warning(self, "Invalid File", 
+                              "Not PDF files:\n" + "\n".join(invalid[:20]))
+            
+    def scan_folders(self, folders):
+        thread = FolderScanThread(folders)
+        thread.found.connect(self.path_model.add_paths)
+        thread.scan_finished.connect(self.scan_finished)
+        thread.finished.connect(lambda: self.scan_threads.remove(thread))
+        self.scan_threads.append(thread)
+        self.scan_started.emit()
+        thread.start()
+        
+    def stop_scans(self):
+        """Interrupt the running folder scans and wait for them to finish."""
+        threads = list(self.scan_threads)
+        for thread in threads:
+            thread.requestInterruption()
+        for thread in threads:
+            thread.wait()
+        
+    def selected_rows(self):
+        return sorted(index.row() for index in self.selectionModel().selectedIndexes())
 
 class ModernButton(QPushButton):
     def __init__(self, text, parent=None):
@@ -254,8 +394,13 @@ class MainWindow(QMainWindow):
         label.setStyleSheet("color: #5E6C84;")
         layout.addWidget(label)
         
-        self.file_list = DragDropListWidget()
+        self.file_list = DragDropListView()
         self.file_list.setMinimumHeight(200)
+        self.file_list.scan_started.connect(
+            lambda: self.statusBar().showMessage("Scanning folders..."))
+        self.file_list.scan_finished.connect(
+            lambda count: self.statusBar().showMessage(
+                f"Folder scan finished: {count} PDFs found, {self.file_list.path_model.rowCount()} queued"))
         layout.addWidget(self.file_list)
         
         # Buttons
@@ -266,12 +411,16 @@ class MainWindow(QMainWindow):
         add_button.clicked.connect(self.add_pdfs)
         button_layout.addWidget(add_button)
         
+        add_folder_button = ModernButton("Add Folder")
+        add_folder_button.clicked.connect(self.add_folder)
+        button_layout.addWidget(add_folder_button)
+        
         remove_button = ModernButton("Remove Selected")
         remove_button.clicked.connect(self.remove_selected)
         button_layout.addWidget(remove_button)
         
         clear_button = ModernButton("Clear All")
-        clear_button.clicked.connect(self.file_list.clear)
+        clear_button.clicked.connect(self.file_list.path_model.clear)
         button_layout.addWidget(clear_button)
         
         layout.addLayout(button_layout)
@@ -360,8 +509,12 @@ class MainWindow(QMainWindow):
     def add_pdfs(self):
         files, _ = QFileDialog.getOpenFileNames(
             self, "Select PDF Files", "", "PDF Files (*.pdf)")
-        for file in files:
-            self.file_list.addItem(file)
+        self.file_list.path_model.add_paths(files)
+        
+    def add_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if folder:
+            self.file_list.scan_folders([folder])
             
     def add_url(self):
         url = self.url_input.text().strip()
@@ -374,21 +527,19 @@ class MainWindow(QMainWindow):
                                   "URL must point to a PDF file.")
                 
     def remove_selected(self):
-        for item in self.file_list.selectedItems():
-            self.file_list.takeItem(self.file_list.row(item))
+        self.file_list.path_model.remove_rows(self.file_list.selected_rows())
             
     def remove_selected_url(self):
         for item in self.url_list.selectedItems():
             self.url_list.takeItem(self.url_list.row(item))
             
     def process_local_pdfs(self):
-        if self.file_list.count() == 0:
+        if self.file_list.path_model.rowCount() == 0:
             QMessageBox.warning(self, "No Files", 
                               "Please add PDF files to process.")
             return
             
-        files = [self.file_list.item(i).text() 
-                for i in range(self.file_list.count())]
+        files = self.file_list.path_model.paths()
         
         output_file, _ = QFileDialog.getSaveFileName(
             self, "Save Results", "", "Excel Files (*.xlsx)")
@@ -436,6 +587,10 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "Error", 
                               "An error occurred during processing.")
+            
+    def closeEvent(self, event):
+        self.file_list.stop_scans()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,106 @@
+import re
+from collections import namedtuple
+from pdf_pages import extract_text_from_pdf
+
+# Egy kivonási szabály: a start és end jelölő közötti szöveg; end=None esetén a szöveg végéig.
+# Kisebb priority érték erősebb szabályt jelent.
+MarkerRule = namedtuple("MarkerRule", ["name", "start", "end", "priority"])
+
+DEFAULT_RULES = (
+    MarkerRule("abstract_key_words", "Abstract", "Key Words", 0),
+    MarkerRule("abstract_keywords", "Abstract", "Keywords", 1),
+    MarkerRule("abstract_colon_words", "Abstract:", "Words:", 2),
+    MarkerRule("absztrakt_kulcsszavak", "Absztrakt", "Kulcsszavak", 3),
+    MarkerRule("osszefoglalo_kulcsszavak", "Összefoglaló", "Kulcsszavak", 4),
+    MarkerRule("osszefoglalas_kulcsszavak", "Összefoglalás", "Kulcsszavak", 5),
+)
+
+# Tartalék szabályok a tobbestEgyesbe régi viselkedéséhez: az "abstract" utáni bekezdés vagy a szöveg vége
+FALLBACK_RULES = (
+    MarkerRule("abstract_paragraph", "Abstract", "\n\n", 8),
+    MarkerRule("abstract_to_end", "Abstract", None, 9),
+)
+
+
+def _clean(content):
+    return content.strip().lstrip(":").strip()
+
+
+class MarkerExtractor:
+    """Finds the text between start/end marker pairs of many rules in one scan.
+
+    All distinct markers are compiled into a single case-insensitive
+    lookahead alternation (longest first), so one pass over the text
+    yields every marker position. For each rule the first start marker
+    and the first end marker after it are taken - the same match
+    re.search(f"{start}(.*?){end}") would give - and the matching rule
+    with the lowest priority value wins. Whitespace and a colon right
+    after the start marker are skipped before the end marker is searched
+    (like the old abstract\s*(.*?) paragraph regex), and a rule that
+    yields empty content gives way to the next one.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = sorted(rules, key=lambda rule: rule.priority)
+        markers = {rule.start for rule in self.rules} | {rule.end for rule in self.rules if rule.end}
+        # Hosszabb jelölő előbb, így egy pozíción mindig a leghosszabb illeszkedő jelölőt kapjuk
+        self.markers = sorted(markers, key=len, reverse=True)
+        alternation = "|".join(re.escape(marker) for marker in self.markers)
+        self.pattern = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+    def scan(self, text):
+        """Return {marker: [positions]} for every marker occurring in text."""
+        positions = {marker: [] for marker in self.markers}
+        for match in self.pattern.finditer(text):
+            found = match.group(1).casefold()
+            # Az azonos pozíción illeszkedő rövidebb jelölők a leghosszabbnak előtagjai
+            for marker in self.markers:
+                if found.startswith(marker.casefold()):
+                    positions[marker].append(match.start())
+        return positions
+
+    def extract(self, text):
+        """Return (content, rule name) for the best matching rule, or (None, None)."""
+        if not isinstance(text, str):
+            return None, None
+        positions = self.scan(text)
+        for rule in self.rules:
+            starts = positions[rule.start]
+            if not starts:
+                continue
+            content_start = starts[0] + len(rule.start)
+            # A jelölő utáni szóközöket és kettőspontot átugorjuk ("Abstract\n\nSzöveg\n\n")
+            while content_start < len(text) and (text[content_start].isspace() or text[content_start] == ":"):
+                content_start += 1
+            if rule.end is None:
+                content = _clean(text[content_start:])
+            else:
+                ends = positions[rule.end]
+                end = next((position for position in ends if position >= content_start), None)
+                content = _clean(text[content_start:end]) if end is not None else ""
+            # Üres tartalom esetén a következő szabály jöhet
+            if content:
+                return content, rule.name
+        return None, None
+
+
+_default_extractor = None
+
+
+def extract_with_rules(text, rules=None):
+    """Extract content from text with the given rules (DEFAULT_RULES if None)."""
+    global _default_extractor
+    if rules is None:
+        if _default_extractor is None:
+            _default_extractor = MarkerExtractor()
+        return _default_extractor.extract(text)
+    return MarkerExtractor(rules).extract(text)
+
+
+def extract_content_from_pdf_with_rules(pdf_path, rules=None):
+    """Read a PDF once and return (content, rule name); (None, None) if no rule matched."""
+    try:
+        return extract_with_rules(extract_text_from_pdf(pdf_path), rules)
+    except Exception as e:
+        print(f"Error processing {pdf_path}: {e}")
+        return None, None
@@ -0,0 +1,97 @@
+import os
+from collections import Counter
+from nltk.tokenize import word_tokenize
+from nltk.tag import pos_tag
+from nltk.chunk import ne_chunk
+
+# spaCy címkék átnevezése az NLTK ne_chunk címkéire
+SPACY_TO_NLTK_LABELS = {
+    'ORG': 'ORGANIZATION',
+    'LOC': 'LOCATION',
+    'FAC': 'FACILITY',
+}
+
+
+class NLTKBackend:
+    """word_tokenize -> pos_tag -> ne_chunk, one document at a time."""
+
+    name = 'nltk'
+
+    def analyze(self, texts):
+        """Return a list of (entities, pos_stats) pairs, one per text."""
+        results = []
+        for text in texts:
+            pos_tags = pos_tag(word_tokenize(text))
+            results.append((self._entities(pos_tags), dict(Counter(tag for word, tag in pos_tags))))
+        return results
+
+    def entities(self, texts):
+        return [self._entities(pos_tag(word_tokenize(text))) for text in texts]
+
+    def pos_stats(self, texts):
+        return [dict(Counter(tag for word, tag in pos_tag(word_tokenize(text)))) for text in texts]
+
+    def _entities(self, pos_tags):
+        entities = {}
+        for chunk in ne_chunk(pos_tags):
+            if hasattr(chunk, 'label'):
+                entity_type = chunk.label()
+                entity_text = ' '.join([token for token, pos in chunk])
+                if entity_type not in entities:
+                    entities[entity_type] = []
+                entities[entity_type].append(entity_text)
+        return entities
+
+
+class SpacyBackend:
+    """Batched spaCy pipeline (nlp.pipe) with unused components disabled.
+
+    Penn Treebank tags (token.tag_) are used for the POS statistics so
+    the output has the same structure as the NLTK backend.
+    """
+
+    name = 'spacy'
+
+    def __init__(self, model='en_core_web_sm', batch_size=64, n_process=None):
+        import spacy
+        self.nlp = spacy.load(model, exclude=['lemmatizer', 'parser', 'textcat'])
+        self.batch_size = batch_size
+        self.n_process = n_process or max(1, (os.cpu_count() or 1) - 1)
+
+    def _docs(self, texts, disable=()):
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        # Kis kötegeknél a folyamatok indítása drágább, mint maga a feldolgozás
+        n_process = self.n_process if len(texts) >= self.batch_size * 2 else 1
+        return self.nlp.pipe(texts, batch_size=self.batch_size, n_process=n_process, disable=list(disable))
+
+    def analyze(self, texts):
+        return [(self._entities(doc), self._pos_stats(doc)) for doc in self._docs(texts)]
+
+    def entities(self, texts):
+        return [self._entities(doc) for doc in self._docs(texts, disable=['tagger', 'attribute_ruler'])]
+
+    def pos_stats(self, texts):
+        return [self._pos_stats(doc) for doc in self._docs(texts, disable=['ner'])]
+
+    def _entities(self, doc):
+        entities = {}
+        for ent in doc.ents:
+            entity_type = SPACY_TO_NLTK_LABELS.get(ent.label_, ent.label_)
+            entities.setdefault(entity_type, []).append(ent.text)
+        return entities
+
+    def _pos_stats(self, doc):
+        return dict(Counter(token.tag_ for token in doc))
+
+
+NLP_BACKENDS = {
+    'nltk': NLTKBackend,
+    'spacy': SpacyBackend,
+}
+
+
+def get_nlp_backend(name='nltk', **kwargs):
+    """Create an NLP backend by name ('nltk' or 'spacy')."""
+    if name not in NLP_BACKENDS:
+        raise ValueError(f"Unknown NLP backend: {name}. Available: {', '.join(NLP_BACKENDS)}")
+    return NLP_BACKENDS[name](**kwargs)
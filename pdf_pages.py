@@ -0,0 +1,71 @@
+import os
+import mmap
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import PyPDF2
+
+# Ennyi oldaltól kezdve osztjuk szét a dokumentumot több folyamat között
+PARALLEL_PAGE_THRESHOLD = 100
+
+_executor = None
+_executor_workers = 0
+
+
+def _extract_page_range(pdf_path, start, stop):
+    """Extract the text of pages [start, stop) from a memory-mapped copy of the file."""
+    with open(pdf_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        reader = PyPDF2.PdfReader(data)
+        return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _get_executor(workers):
+    """Process pool shared by all PDFs, grown if more workers are requested.
+
+    Starting a pool is costly: under the spawn start method (Windows,
+    macOS) every worker re-imports the launching script's __main__
+    module, e.g. main.py with tobbestEgyesbe's NLTK setup. Reusing one
+    pool pays that once per worker instead of once per large PDF. Spawn
+    is used on every platform: the pool is first created from the GUI's
+    worker QThread, and forking a multithreaded process is unsafe.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers < workers:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown_executor():
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+        _executor, _executor_workers = None, 0
+
+
+atexit.register(shutdown_executor)
+
+
+def extract_text_from_pdf(pdf_path, page_threshold=PARALLEL_PAGE_THRESHOLD, workers=None):
+    """Extract the full text of a PDF.
+
+    Documents with at least page_threshold pages are split into
+    contiguous page ranges, one per worker process; each worker opens and
+    memory-maps the file on its own, and the text is joined back in page
+    order. The worker pool is created on first use and reused for later
+    documents.
+    """
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        page_count = len(reader.pages)
+        workers = min(workers or os.cpu_count() or 1, page_count)
+        if page_count < page_threshold or workers < 2:
+            return "".join(page.extract_text() for page in reader.pages)
+
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    executor = _get_executor(len(ranges))
+    futures = [executor.submit(_extract_page_range, pdf_path, start, stop) for start, stop in ranges]
+    return "".join("".join(future.result()) for future in futures)
@@ -0,0 +1,62 @@
+import hashlib
+import sqlite3
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """Sentiment and readability scores keyed by the SHA-1 of the text.
+
+    Without a path the cache lives only in memory; with a path it is
+    backed by an SQLite file, so a rerun over the same abstracts reuses
+    the stored scores.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.memory = {}
+        self.connection = None
+        if path:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores (hash TEXT PRIMARY KEY, sentiment REAL, readability REAL)")
+            self.connection.commit()
+
+    def get_many(self, hashes):
+        """Return {hash: (sentiment, readability)} for the hashes found in the cache."""
+        found = {h: self.memory[h] for h in hashes if h in self.memory}
+        missing = [h for h in hashes if h not in found]
+        if self.connection is not None and missing:
+            # SQLite paraméterlimit miatt darabokban kérdezünk le
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                rows = self.connection.execute(
+                    f"SELECT hash, sentiment, readability FROM scores WHERE hash IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                for h, sentiment, readability in rows:
+                    found[h] = self.memory[h] = (sentiment, readability)
+        return found
+
+    def put_many(self, scores):
+        """Store {hash: (sentiment, readability)}; None means not computed yet."""
+        for h, (sentiment, readability) in scores.items():
+            old_sentiment, old_readability = self.memory.get(h, (None, None))
+            self.memory[h] = (
+                sentiment if sentiment is not None else old_sentiment,
+                readability if readability is not None else old_readability,
+            )
+        if self.connection is not None and scores:
+            self.connection.executemany(
+                "INSERT INTO scores (hash, sentiment, readability) VALUES (?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET "
+                "sentiment = COALESCE(excluded.sentiment, sentiment), "
+                "readability = COALESCE(excluded.readability, readability)",
+                [(h, self.memory[h][0], self.memory[h][1]) for h in scores])
+            self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
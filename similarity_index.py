@@ -0,0 +1,129 @@
+import os
+import json
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.decomposition import TruncatedSVD
+from tobbestEgyesbe import TextAnalyzer
+
+MODEL_FILE = "model.pkl"
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.txt"
+META_FILE = "meta.json"
+
+
+class SimilarityIndex:
+    """Persistent top-k nearest-neighbour index over abstracts.
+
+    Documents are vectorized with the same TF-IDF settings as
+    TextAnalyzer, optionally reduced with TruncatedSVD, L2-normalized and
+    stored as a flat float32 file that is memory-mapped on load. New
+    documents are appended without refitting the model.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.analyzer = None
+        with open(os.path.join(index_dir, MODEL_FILE), "rb") as f:
+            model = pickle.load(f)
+        self.vectorizer = model["vectorizer"]
+        self.svd = model["svd"]
+        with open(os.path.join(index_dir, META_FILE), "r", encoding="utf-8") as f:
+            self.dim = json.load(f)["dim"]
+        with open(os.path.join(index_dir, IDS_FILE), "r", encoding="utf-8") as f:
+            self.doc_ids = [line.rstrip("\n") for line in f]
+        self._open_vectors()
+
+    def _open_vectors(self):
+        path = os.path.join(self.index_dir, VECTORS_FILE)
+        if self.doc_ids:
+            self.vectors = np.memmap(path, dtype=np.float32, mode="r", shape=(len(self.doc_ids), self.dim))
+        else:
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+
+    @classmethod
+    def build(cls, index_dir, doc_ids, texts, n_components=256, processed=False):
+        """Fit the model on texts, write a new index to index_dir and return it loaded."""
+        os.makedirs(index_dir, exist_ok=True)
+        analyzer = TextAnalyzer()
+        if not processed:
+            texts = [analyzer.process_text(text) for text in texts]
+        vectorizer = clone(analyzer.vectorizer)
+        tfidf = vectorizer.fit_transform(texts)
+
+        # Kis korpuszon nincs értelme a dimenziócsökkentésnek
+        svd = None
+        n_components = min(n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1)
+        if n_components > 1:
+            svd = TruncatedSVD(n_components=n_components, random_state=42).fit(tfidf)
+        dim = svd.n_components if svd is not None else tfidf.shape[1]
+
+        with open(os.path.join(index_dir, MODEL_FILE), "wb") as f:
+            pickle.dump({"vectorizer": vectorizer, "svd": svd}, f)
+        with open(os.path.join(index_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"dim": dim}, f)
+        open(os.path.join(index_dir, VECTORS_FILE), "wb").close()
+        open(os.path.join(index_dir, IDS_FILE), "w", encoding="utf-8").close()
+
+        index = cls(index_dir)
+        index.analyzer = analyzer
+        index.add(doc_ids, texts, processed=True)
+        return index
+
+    @classmethod
+    def load(cls, index_dir):
+        return cls(index_dir)
+
+    def embed(self, texts, processed=False):
+        """Return L2-normalized float32 vectors for texts."""
+        if not processed:
+            if self.analyzer is None:
+                self.analyzer = TextAnalyzer()
+            texts = [self.analyzer.process_text(text) for text in texts]
+        matrix = self.vectorizer.transform(texts)
+        if self.svd is not None:
+            matrix = self.svd.transform(matrix)
+        else:
+            matrix = matrix.toarray()
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    def add(self, doc_ids, texts, processed=False):
+        """Append documents to the index on disk."""
+        doc_ids = [str(doc_id) for doc_id in doc_ids]
+        if not doc_ids:
+            return
+        vectors = self.embed(texts, processed)
+        # A memory map elengedése, mert Windowson a leképezett fájl nem bővíthető
+        self.vectors = None
+        with open(os.path.join(self.index_dir, VECTORS_FILE), "ab") as f:
+            f.write(vectors.tobytes())
+        with open(os.path.join(self.index_dir, IDS_FILE), "a", encoding="utf-8") as f:
+            f.writelines(f"{doc_id}\n" for doc_id in doc_ids)
+        self.doc_ids.extend(doc_ids)
+        self._open_vectors()
+
+    def query(self, text, top_k=10, processed=False):
+        """Return the top_k most similar documents as (doc_id, cosine similarity) pairs."""
+        if not self.doc_ids:
+            return []
+        vector = self.embed([text], processed)[0]
+        scores = self.vectors @ vector
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.doc_ids[i], float(scores[i])) for i in top]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+
+def build_index_from_excel(excel_file, index_dir, n_components=256):
+    """Build an index from a process_pdfs workbook using its Singularized column."""
+    df = pd.read_excel(excel_file)
+    df = df[df["Singularized"].notna()]
+    return SimilarityIndex.build(index_dir, df["File_Name"].tolist(), df["Singularized"].astype(str).tolist(),
+                                 n_components=n_components, processed=True)
@@ -1,6 +1,5 @@
 import pandas as pd
-from collections import Counter
-import re
+from token_corpus import TokenCorpus
 
 def count_words_in_excel(input_excel, output_file=None):
     # Excel beolvasása
@@ -17,14 +16,11 @@ def count_words_in_excel(input_excel, output_file=None):
 
     # Második oszlop szövegének összegyűjtése
     column_name = df.columns[1]  # Második oszlop neve
-    text_data = " ".join(df[column_name].dropna().astype(str))  # Összes szöveg összefűzése
+    # Szavak egész azonosítókká kódolása (kisbetűsítve), gyakoriság számítás bincount-tal
+    corpus = TokenCorpus.from_texts(df[column_name].dropna().astype(str))
 
-    # Szavak kigyűjtése és gyakoriság számítás
-    words = re.findall(r'\b\w+\b', text_data.lower())  # Szavak kigyűjtése (kisbetűkre váltva)
-    word_counts = Counter(words)
-
-    # 250 leggyakoribb szó kigyűjtése
-    most_common_words = word_counts.most_common(550)
+    # 550 leggyakoribb szó kigyűjtése
+    most_common_words = corpus.most_common(550)
 
     # Eredmények kiíratása
     print("Leggyakoribb szavak és előfordulásuk száma:")
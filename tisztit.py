@@ -1,14 +1,12 @@
 import pandas as pd
-from nltk.corpus import stopwords
+import numpy as np
 from collections import Counter
-import nltk
-
-nltk.download('stopwords')
+from token_corpus import TokenCorpus
+from analysis_service import get_stopwords
 
 def clean_text_from_stopwords(input_excel, output_excel):
-    # Magyar és angol stop wordök beállítása
-    stop_words = stopwords.words('english')
-    stop_word_counter = Counter()
+    # Angol stop wordök: a futó elemző szolgáltatástól, vagy helyben az NLTK-ból
+    stop_words = set(get_stopwords())
 
     # Excel beolvasása
     try:
@@ -23,11 +21,11 @@ def clean_text_from_stopwords(input_excel, output_excel):
         return
 
     column_name = df.columns[1]  # Második oszlop neve
-    df['Cleaned_Text'] = df[column_name].apply(lambda text: clean_and_count_stopwords(text, stop_words, stop_word_counter))
+    df['Cleaned_Text'], stop_word_counts = clean_column_from_stopwords(df[column_name], stop_words)
 
     # Stop word statisztikák kiíratása
     print("Eltávolított stop wordök száma:")
-    for word, count in stop_word_counter.most_common():
+    for word, count in stop_word_counts:
         print(f"{word}: {count}")
 
     # Új fájl mentése
@@ -37,23 +35,30 @@ def clean_text_from_stopwords(input_excel, output_excel):
     except Exception as e:
         print(f"Hiba a fájl mentésekor: {e}")
 
-def clean_and_count_stopwords(text, stop_words, counter):
-    """Eltávolítja a stop wordöket a szövegből és számolja őket."""
-    if not isinstance(text, str):
-        return text  # Ha nem szöveg, hagyjuk érintetlenül
+def clean_column_from_stopwords(texts, stop_words):
+    """Eltávolítja a stop wordöket egy teljes oszlopból.
 
-    words = text.split()
-    cleaned_words = []
+    A szavak egész azonosítókká kódolva, maszkkal szűrve és bincount-tal
+    számolva kerülnek feldolgozásra. Visszaadja a tisztított oszlopot és a
+    (stop word, darabszám) párokat csökkenő sorrendben.
+    """
+    is_text = texts.apply(lambda text: isinstance(text, str))
+    corpus = TokenCorpus.from_texts(texts[is_text], tokenizer=str.split)
+    stop_mask = corpus.term_mask(predicate=lambda word: word.lower() in stop_words)
 
-    for word in words:
-        if word.lower() in stop_words:
-            counter[word.lower()] += 1
-        else:
-            cleaned_words.append(word)
+    # Kis- és nagybetűs alakok összevonása, az első előfordulás sorrendjében
+    counter = Counter()
+    counts = corpus.counts()
+    for term_id in np.flatnonzero(stop_mask):
+        counter[corpus.vocab[term_id].lower()] += int(counts[term_id])
 
-    return " ".join(cleaned_words)
+    cleaned_corpus = corpus.filter(stop_mask)
+    cleaned = texts.copy()
+    cleaned[is_text] = [" ".join(cleaned_corpus.document(i)) for i in range(len(cleaned_corpus))]
+    return cleaned, counter.most_common()
 
-input_excel = "D:/Input.xlsx"  # Az eredeti Excel fájl neve
-output_excel = "output_cleaned.xlsx"  # A megtisztított Excel fájl neve
+if __name__ == "__main__":
+    input_excel = "D:/Input.xlsx"  # Az eredeti Excel fájl neve
+    output_excel = "output_cleaned.xlsx"  # A megtisztított Excel fájl neve
 
-clean_text_from_stopwords(input_excel, output_excel)
\ No newline at end of file
+    clean_text_from_stopwords(input_excel, output_excel)
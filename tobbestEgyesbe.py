@@ -2,24 +2,30 @@ import pandas as pd
 import nltk
 from nltk.stem import WordNetLemmatizer
 from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.tag import pos_tag
-from nltk.chunk import ne_chunk
+from nltk.tokenize import sent_tokenize, word_tokenize, NLTKWordTokenizer
 from textblob import TextBlob
+from textblob.sentiments import PatternAnalyzer
 import re
 import string
 from collections import Counter
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.figure import Figure
 from wordcloud import WordCloud
 from datetime import datetime
-import PyPDF2
+from openpyxl.utils import get_column_letter
 import requests
 from urllib.parse import urlparse
 import os
+from dedup import find_duplicate_clusters
+from nlp_backends import get_nlp_backend
+from analysis_service import analyze
+from token_corpus import TokenCorpus
+from pdf_pages import extract_text_from_pdf
+from wordcloud_render import render_wordcloud
+from marker_extraction import DEFAULT_RULES, FALLBACK_RULES, MarkerExtractor
+from score_cache import ScoreCache, text_hash
 
 # NLTK adatok letöltése
 nltk.download('wordnet')
@@ -29,13 +35,28 @@ nltk.download('averaged_perceptron_tagger')
 nltk.download('maxent_ne_chunker')
 nltk.download('words')
 
+# Abstract jelölőpárok prioritási sorrendben
+ABSTRACT_RULES = DEFAULT_RULES + FALLBACK_RULES
+abstract_extractor = MarkerExtractor(ABSTRACT_RULES)
+
 # Stop words lista
 stop_words = set(stopwords.words('english'))
 
 class TextAnalyzer:
-    def __init__(self):
+    def __init__(self, nlp_backend='nltk', score_cache=None):
         self.lemmatizer = WordNetLemmatizer()
         self.vectorizer = TfidfVectorizer(max_features=1000)
+        # NER/POS motor: 'nltk', 'spacy' vagy egy kész backend példány
+        if isinstance(nlp_backend, str):
+            nlp_backend = get_nlp_backend(nlp_backend)
+        self.nlp_backend = nlp_backend
+        # Kötegelt pontozáshoz: közös TextBlob lexikon és szótokenizáló, pontszám gyorsítótár
+        # (score_cache: None = csak memóriában, fájlnév = SQLite, vagy egy ScoreCache példány)
+        if not isinstance(score_cache, ScoreCache):
+            score_cache = ScoreCache(score_cache)
+        self.score_cache = score_cache
+        self.sentiment_analyzer = PatternAnalyzer()
+        self.word_tokenizer = NLTKWordTokenizer()
         
     def clean_text(self, text):
         if not isinstance(text, str):
@@ -85,30 +106,27 @@ class TextAnalyzer:
         word_freq = Counter(words)
         return ', '.join([word for word, _ in word_freq.most_common(top_n)])
 
+    def get_keywords_batch(self, texts, top_n=5):
+        # Ugyanaz, mint a get_keywords, de egész kódolású korpuszon, egyszerre az összes szövegre
+        corpus = TokenCorpus.from_texts(texts, tokenizer=str.split)
+        return [', '.join(terms) if isinstance(text, str) else None
+                for text, terms in zip(texts, corpus.top_terms_per_document(top_n))]
+
     def get_sentiment(self, text):
         analysis = TextBlob(text)
         return analysis.sentiment.polarity
 
     def get_entities(self, text):
-        tokens = word_tokenize(text)
-        pos_tags = pos_tag(tokens)
-        named_entities = ne_chunk(pos_tags)
-        
-        entities = {}
-        for chunk in named_entities:
-            if hasattr(chunk, 'label'):
-                entity_type = chunk.label()
-                entity_text = ' '.join([token for token, pos in chunk])
-                if entity_type not in entities:
-                    entities[entity_type] = []
-                entities[entity_type].append(entity_text)
-        return entities
+        return self.nlp_backend.entities([text])[0]
 
     def get_pos_stats(self, text):
-        tokens = word_tokenize(text)
-        pos_tags = pos_tag(tokens)
-        pos_counts = Counter(tag for word, tag in pos_tags)
-        return dict(pos_counts)
+        return self.nlp_backend.pos_stats([text])[0]
+
+    def get_entities_batch(self, texts):
+        return self.nlp_backend.entities(texts)
+
+    def get_pos_stats_batch(self, texts):
+        return self.nlp_backend.pos_stats(texts)
 
     def get_readability_score(self, text):
         sentences = sent_tokenize(text)
@@ -118,13 +136,60 @@ class TextAnalyzer:
         avg_sentence_length = len(words) / len(sentences)
         return 100 - (avg_sentence_length * 10)
 
+    def _readability_from_sentences(self, sentences):
+        # Ugyanaz, mint a get_readability_score, de a mondatokat csak egyszer bontjuk fel
+        # (a word_tokenize is mondatonként tokenizál)
+        if not sentences:
+            return 0
+        word_count = sum(len(self.word_tokenizer.tokenize(sentence)) for sentence in sentences)
+        avg_sentence_length = word_count / len(sentences)
+        return 100 - (avg_sentence_length * 10)
+
+    def score_texts(self, texts, sentiment=True, readability=True):
+        """Polarity and readability for a batch of texts, cached by text hash.
+
+        Gives the same values as get_sentiment and get_readability_score;
+        non-string texts get None. Returns (polarities, readabilities).
+        """
+        texts = list(texts)
+        hashes = [text_hash(text) if isinstance(text, str) else None for text in texts]
+        cached = self.score_cache.get_many(list({h for h in hashes if h}))
+        computed = {}
+        for text, h in zip(texts, hashes):
+            if h is None:
+                continue
+            old_sentiment, old_readability = computed.get(h) or cached.get(h) or (None, None)
+            need_sentiment = sentiment and old_sentiment is None
+            need_readability = readability and old_readability is None
+            if need_sentiment or need_readability:
+                computed[h] = (
+                    self.sentiment_analyzer.analyze(text).polarity if need_sentiment else old_sentiment,
+                    self._readability_from_sentences(sent_tokenize(text)) if need_readability else old_readability,
+                )
+        self.score_cache.put_many(computed)
+        scores = {**cached, **computed}
+        polarities = [scores[h][0] if h else None for h in hashes]
+        readabilities = [scores[h][1] if h else None for h in hashes]
+        return polarities, readabilities
+
+    def get_sentiment_batch(self, texts):
+        return self.score_texts(texts, readability=False)[0]
+
+    def get_readability_batch(self, texts):
+        return self.score_texts(texts, sentiment=False)[1]
+
     def generate_wordcloud(self, text, output_file='wordcloud.png'):
         wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.savefig(output_file)
-        plt.close()
+        # Objektumorientált matplotlib API pyplot nélkül, így GUI munkaszálból is biztonságos
+        figure = Figure(figsize=(10, 5))
+        axes = figure.add_subplot()
+        axes.imshow(wordcloud, interpolation='bilinear')
+        axes.axis('off')
+        figure.savefig(output_file)
+
+    def generate_wordcloud_from_frequencies(self, frequencies, output_file='wordcloud.png', cache_dir=None):
+        """Render a word cloud from already computed {word: count} frequencies."""
+        return render_wordcloud(frequencies, output_file, cache_dir)
 
     def get_tfidf_keywords(self, texts, top_n=5):
         tfidf_matrix = self.vectorizer.fit_transform(texts)
@@ -137,26 +202,25 @@ class TextAnalyzer:
         top_indices = avg_tfidf.argsort()[-top_n:][::-1]
         return [feature_names[i] for i in top_indices]
 
-def extract_abstract_from_pdf(pdf_path):
-    """Extract abstract from PDF file."""
+def extract_abstract_from_pdf(pdf_path, return_rule=False):
+    """Extract abstract from PDF file.
+
+    All marker rules (English and Hungarian, then the paragraph fallback)
+    are matched in a single scan; with return_rule the name of the
+    matching rule is returned as well.
+    """
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            
-            # Abstract extraction logic
-            abstract_pattern = r'abstract\s*(.*?)(?=\n\n|\Z)'
-            abstract_match = re.search(abstract_pattern, text, re.IGNORECASE | re.DOTALL)
-            
-            if abstract_match:
-                return abstract_match.group(1).strip()
-            else:
-                return text[:500]  # Return first 500 characters if no abstract found
+        # Large documents are extracted page-parallel
+        text = extract_text_from_pdf(pdf_path)
+        
+        # Abstract extraction logic
+        abstract, rule = abstract_extractor.extract(text)
+        if abstract is None:
+            abstract, rule = text[:500], None  # Return first 500 characters if no abstract found
     except Exception as e:
         print(f"Error processing PDF {pdf_path}: {e}")
-        return ""
+        abstract, rule = "", None
+    return (abstract, rule) if return_rule else abstract
 
 def download_pdf_from_url(url, output_dir="downloads"):
     """Download PDF from URL."""
@@ -180,68 +244,176 @@ def download_pdf_from_url(url, output_dir="downloads"):
         print(f"Error downloading PDF from {url}: {e}")
         return None
 
-def process_pdfs(pdf_files, output_file="abstracts.xlsx"):
-    """Process multiple PDF files and extract abstracts."""
-    analyzer = TextAnalyzer()
-    results = []
+# Számított oszlopok: oszlop -> (függőségek, számítás a függőségek értékeiből)
+COLUMN_STAGES = {
+    'Cleaned_Text': (('Original_Abstract',), lambda analyzer, abstract: analyzer.clean_text(abstract)),
+    'No_Stopwords': (('Cleaned_Text',), lambda analyzer, text: analyzer.remove_stopwords(text)),
+    'Singularized': (('No_Stopwords',), lambda analyzer, text: analyzer.process_text(text)),
+    'Keywords': (('Singularized',), lambda analyzer, text: analyzer.get_keywords(text)),
+    'Sentiment': (('Original_Abstract',), lambda analyzer, abstract: analyzer.get_sentiment(abstract)),
+    'Readability': (('Original_Abstract',), lambda analyzer, abstract: analyzer.get_readability_score(abstract)),
+}
+# Oszlopok, amelyek egyszerre, kötegelve is számíthatók: oszlop -> számítás a függőség teljes oszlopából
+BATCH_STAGES = {
+    'Keywords': lambda analyzer, texts: analyzer.get_keywords_batch(texts),
+    'Sentiment': lambda analyzer, abstracts: analyzer.get_sentiment_batch(abstracts),
+    'Readability': lambda analyzer, abstracts: analyzer.get_readability_batch(abstracts),
+}
+ALL_COLUMNS = tuple(COLUMN_STAGES)
+OUTPUT_COLUMN_ORDER = ('File_Name', 'Original_Abstract') + ALL_COLUMNS + (
+    'Marker_Rule', 'Duplicate_Cluster', 'Processed_At')
+
+def resolve_columns(columns):
+    """Return the computed columns needed for columns, dependencies first."""
+    ordered = []
+    
+    def visit(column):
+        if column in ordered or column not in COLUMN_STAGES:
+            return
+        for dependency in COLUMN_STAGES[column][0]:
+            visit(dependency)
+        ordered.append(column)
     
+    for column in columns:
+        if column not in COLUMN_STAGES and column not in OUTPUT_COLUMN_ORDER:
+            raise ValueError(f"Unknown column: {column}. Available: {', '.join(ALL_COLUMNS)}")
+        visit(column)
+    return ordered
+
+def compute_columns(df, columns=ALL_COLUMNS, analyzer=None, rows=None):
+    """Compute the requested columns (and their dependencies) that df does not have yet.
+
+    Values already present are reused and only the empty cells are
+    computed, so a later run can add skipped columns from the stored
+    Original_Abstract. rows optionally restricts the computation to a
+    boolean mask; other rows are left as they are.
+    """
+    if analyzer is None:
+        analyzer = TextAnalyzer()
+    if rows is None:
+        rows = pd.Series(True, index=df.index)
+    for column in resolve_columns(columns):
+        missing = rows & df[column].isna() if column in df.columns else rows
+        if not missing.any():
+            continue
+        dependencies, compute = COLUMN_STAGES[column]
+        values = None
+        if column in BATCH_STAGES:
+            try:
+                values = BATCH_STAGES[column](analyzer, df.loc[missing, dependencies[0]].tolist())
+            except Exception as e:
+                print(f"Error computing {column} in batch, falling back to single texts: {e}")
+        if values is None:
+            values = []
+            for args in zip(*(df.loc[missing, dependency] for dependency in dependencies)):
+                try:
+                    values.append(compute(analyzer, *args))
+                except Exception as e:
+                    print(f"Error computing {column}: {e}")
+                    values.append(None)
+        if column not in df.columns:
+            df[column] = None
+        df[column] = df[column].astype(object)
+        df.loc[missing, column] = pd.Series(values, index=df.index[missing], dtype=object)
+    return df
+
+def save_results_to_excel(df, output_file):
+    """Save the results with formatted column widths."""
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Abstracts')
+        
+        # Get the workbook and the worksheet
+        workbook = writer.book
+        worksheet = writer.sheets['Abstracts']
+        
+        # Format column widths
+        for idx, col in enumerate(df.columns):
+            max_length = max(
+                df[col].map(lambda value: len(str(value))).max(),
+                len(str(col))
+            )
+            worksheet.column_dimensions[get_column_letter(idx + 1)].width = min(max_length + 2, 50)
+
+def process_pdfs(pdf_files, output_file="abstracts.xlsx", skip_duplicates=False, dedup_threshold=0.8,
+                 index_dir=None, columns=ALL_COLUMNS, score_cache=None):
+    """Process multiple PDF files and extract abstracts.
+
+    Only the analysis columns listed in columns (and the ones they depend
+    on) are computed; File_Name, Original_Abstract, Marker_Rule,
+    Duplicate_Cluster and Processed_At are always written. Skipped
+    columns can be added later with add_columns_to_excel.
+    Near-duplicate abstracts (MinHash/LSH) share a Duplicate_Cluster id.
+    With skip_duplicates only the first file of each cluster goes through
+    the NLP stages; the others keep just their abstract and cluster id.
+    If index_dir is given, the Singularized tokens are added to the
+    inverted index stored there. score_cache is an optional SQLite file
+    for sentiment/readability scores reused across runs.
+    """
+    analyzer = TextAnalyzer(score_cache=score_cache)
+    if index_dir and 'Singularized' not in columns:
+        columns = tuple(columns) + ('Singularized',)
+    
+    # Extract abstracts
+    results = []
     for pdf_file in pdf_files:
         try:
-            # Extract abstract
-            abstract = extract_abstract_from_pdf(pdf_file)
-            
-            # Process text
-            cleaned_text = analyzer.clean_text(abstract)
-            no_stopwords = analyzer.remove_stopwords(cleaned_text)
-            singularized = analyzer.process_text(no_stopwords)
-            
-            # Get additional information
-            keywords = analyzer.get_keywords(singularized)
-            sentiment = analyzer.get_sentiment(abstract)
-            readability = analyzer.get_readability_score(abstract)
-            
-            # Add to results
+            abstract, rule = extract_abstract_from_pdf(pdf_file, return_rule=True)
             results.append({
                 'File_Name': os.path.basename(pdf_file),
                 'Original_Abstract': abstract,
-                'Cleaned_Text': cleaned_text,
-                'No_Stopwords': no_stopwords,
-                'Singularized': singularized,
-                'Keywords': keywords,
-                'Sentiment': sentiment,
-                'Readability': readability,
-                'Processed_At': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'Marker_Rule': rule,
             })
-            
         except Exception as e:
             print(f"Error processing {pdf_file}: {e}")
-            continue
     
-    # Create DataFrame and save to Excel
-    if results:
-        df = pd.DataFrame(results)
-        
-        # Save to Excel with formatting
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Abstracts')
-            
-            # Get the workbook and the worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Abstracts']
-            
-            # Format column widths
-            for idx, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(str(col))
-                )
-                worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
-        
-        print(f"Results saved to {output_file}")
-        return True
-    else:
+    if not results:
         print("No results to save")
         return False
+    df = pd.DataFrame(results)
+    
+    # Near-duplicate clusters over the cleaned abstracts
+    df['Duplicate_Cluster'] = find_duplicate_clusters(
+        [analyzer.clean_text(abstract) for abstract in df['Original_Abstract']], threshold=dedup_threshold)
+    rows = pd.Series(True, index=df.index)
+    if skip_duplicates:
+        rows = ~df['Duplicate_Cluster'].duplicated()
+        for file_name, cluster in zip(df.loc[~rows, 'File_Name'], df.loc[~rows, 'Duplicate_Cluster']):
+            print(f"Skipping {file_name}: duplicate of cluster {cluster}")
+    
+    # Process text, only the requested stages
+    compute_columns(df, columns, analyzer, rows)
+    df['Processed_At'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    df = df[[column for column in OUTPUT_COLUMN_ORDER if column in df.columns]]
+    
+    # Update the full-text index
+    if index_dir:
+        from inverted_index import InvertedIndex
+        indexed = df[df['Singularized'].notna()]
+        InvertedIndex(index_dir).add_documents(indexed['File_Name'].tolist(), indexed['Singularized'].tolist())
+    
+    # Save to Excel with formatting
+    save_results_to_excel(df, output_file)
+    print(f"Results saved to {output_file}")
+    return True
+
+def add_columns_to_excel(input_file, columns=ALL_COLUMNS, output_file=None, score_cache=None,
+                         skip_duplicates=False):
+    """Compute columns skipped by an earlier process_pdfs run from its stored abstracts.
+
+    Only empty cells are filled. Pass the skip_duplicates value of the
+    original process_pdfs run: with it the later files of each
+    Duplicate_Cluster stay empty.
+    """
+    df = pd.read_excel(input_file, sheet_name='Abstracts')
+    rows = None
+    if skip_duplicates and 'Duplicate_Cluster' in df.columns:
+        rows = ~df['Duplicate_Cluster'].duplicated()
+    compute_columns(df, columns, TextAnalyzer(score_cache=score_cache), rows)
+    df = df[[column for column in OUTPUT_COLUMN_ORDER if column in df.columns]
+            + [column for column in df.columns if column not in OUTPUT_COLUMN_ORDER]]
+    save_results_to_excel(df, output_file or input_file)
+    print(f"Results saved to {output_file or input_file}")
+    return df
 
 def process_urls(urls, output_file="abstracts.xlsx"):
     """Process PDFs from URLs."""
@@ -262,9 +434,10 @@ def process_text(text):
     """
     Standalone function to process text using TextAnalyzer.
     This function is provided for backward compatibility and simpler usage.
+    Uses the warm analysis service when it is running, otherwise a shared
+    in-process analyzer.
     """
-    analyzer = TextAnalyzer()
-    return analyzer.process_text(text)
+    return analyze('process_text', [text])[0]
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,125 @@
+import os
+import re
+import numpy as np
+
+VOCAB_FILE = "vocab.txt"
+TOKENS_FILE = "tokens.npy"
+OFFSETS_FILE = "offsets.npy"
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+def word_tokenizer(text):
+    """Lowercased \\w+ words, as counted by szoszamlalo."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+class TokenCorpus:
+    """Integer-encoded token corpus.
+
+    Terms are interned into a vocabulary in order of first occurrence;
+    all documents share one token-id array, document i being
+    tokens[offsets[i]:offsets[i + 1]]. Counting and filtering run as
+    NumPy operations over these arrays.
+    """
+
+    def __init__(self, vocab, tokens, offsets):
+        self.vocab = list(vocab)
+        self.term_to_id = {term: i for i, term in enumerate(self.vocab)}
+        self.tokens = tokens
+        self.offsets = offsets
+
+    @classmethod
+    def from_texts(cls, texts, tokenizer=word_tokenizer):
+        term_to_id = {}
+        ids = []
+        offsets = [0]
+        for text in texts:
+            if isinstance(text, str):
+                ids.extend(term_to_id.setdefault(term, len(term_to_id)) for term in tokenizer(text))
+            offsets.append(len(ids))
+        return cls(term_to_id, np.array(ids, dtype=np.int32), np.array(offsets, dtype=np.int64))
+
+    def save(self, corpus_dir):
+        os.makedirs(corpus_dir, exist_ok=True)
+        with open(os.path.join(corpus_dir, VOCAB_FILE), "w", encoding="utf-8") as f:
+            f.writelines(f"{term}\n" for term in self.vocab)
+        np.save(os.path.join(corpus_dir, TOKENS_FILE), self.tokens)
+        np.save(os.path.join(corpus_dir, OFFSETS_FILE), self.offsets)
+
+    @classmethod
+    def load(cls, corpus_dir, mmap=True):
+        """Load a saved corpus; with mmap the token arrays are memory-mapped read-only."""
+        mmap_mode = "r" if mmap else None
+        with open(os.path.join(corpus_dir, VOCAB_FILE), "r", encoding="utf-8") as f:
+            vocab = [line.rstrip("\n") for line in f]
+        tokens = np.load(os.path.join(corpus_dir, TOKENS_FILE), mmap_mode=mmap_mode)
+        offsets = np.load(os.path.join(corpus_dir, OFFSETS_FILE), mmap_mode=mmap_mode)
+        return cls(vocab, tokens, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def document_ids(self, i):
+        return self.tokens[self.offsets[i]:self.offsets[i + 1]]
+
+    def document(self, i):
+        return [self.vocab[token] for token in self.document_ids(i)]
+
+    def counts(self):
+        """Corpus-wide term frequencies indexed by term id."""
+        return np.bincount(self.tokens, minlength=len(self.vocab))
+
+    def document_frequencies(self):
+        """Number of documents containing each term, indexed by term id."""
+        if not self.vocab:
+            return np.zeros(0, dtype=np.int64)
+        lengths = np.diff(self.offsets)
+        doc_index = np.repeat(np.arange(len(self), dtype=np.int64), lengths)
+        pairs = np.unique(doc_index * len(self.vocab) + self.tokens)
+        return np.bincount(pairs % len(self.vocab), minlength=len(self.vocab))
+
+    def most_common(self, n=None, counts=None):
+        """(term, count) pairs by descending count; ties keep first-occurrence order like Counter."""
+        if counts is None:
+            counts = self.counts()
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        if n is not None:
+            order = order[:n]
+        return [(self.vocab[i], int(counts[i])) for i in order]
+
+    def term_mask(self, terms=None, predicate=None):
+        """Boolean mask over the vocabulary: terms in the given set or matching predicate."""
+        mask = np.zeros(len(self.vocab), dtype=bool)
+        if terms is not None:
+            ids = [self.term_to_id[term] for term in terms if term in self.term_to_id]
+            mask[ids] = True
+        if predicate is not None:
+            mask |= np.fromiter((predicate(term) for term in self.vocab), dtype=bool, count=len(self.vocab))
+        return mask
+
+    def filter(self, mask):
+        """Return a new corpus without the tokens whose term id is set in mask."""
+        keep = ~mask[self.tokens]
+        kept_per_doc = np.concatenate(([0], np.cumsum(keep)))
+        return TokenCorpus(self.vocab, self.tokens[keep], kept_per_doc[self.offsets])
+
+    def top_terms_per_document(self, n=5):
+        """Top-n terms of every document; ties keep first-occurrence order like Counter."""
+        if not self.vocab:
+            return [[] for _ in range(len(self))]
+        # Egyetlen rendezés az összes (dokumentum, szó) páron
+        lengths = np.diff(self.offsets)
+        doc_index = np.repeat(np.arange(len(self), dtype=np.int64), lengths)
+        keys, first, counts = np.unique(doc_index * len(self.vocab) + self.tokens,
+                                        return_index=True, return_counts=True)
+        docs = keys // len(self.vocab)
+        order = np.lexsort((first, -counts, docs))
+        docs, terms = docs[order], (keys % len(self.vocab))[order]
+        # Rang a dokumentumon belül: pozíció mínusz a dokumentum első párjának pozíciója
+        group_start = np.searchsorted(docs, docs, side="left")
+        keep = np.arange(len(docs)) - group_start < n
+        docs, terms = docs[keep], terms[keep]
+        bounds = np.searchsorted(docs, np.arange(len(self) + 1))
+        return [[self.vocab[term] for term in terms[bounds[i]:bounds[i + 1]]] for i in range(len(self))]
@@ -0,0 +1,107 @@
+import os
+import json
+import shutil
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from wordcloud import WordCloud
+
+DEFAULT_OPTIONS = {"width": 800, "height": 400, "background_color": "white", "max_words": 200}
+
+
+def frequencies_from_texts(texts):
+    """Word frequencies of already processed (e.g. Singularized) texts, without re-tokenizing."""
+    counter = Counter()
+    for text in texts:
+        if isinstance(text, str):
+            counter.update(text.split())
+    return counter
+
+
+def cache_key(frequencies, options):
+    """Stable hash of the frequency content and the render options."""
+    # float(): NumPy számok (pl. TokenCorpus.counts()) is szerializálhatók legyenek
+    items = sorted((word, float(count)) for word, count in frequencies.items())
+    payload = json.dumps([items, sorted(options.items())], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def render_wordcloud(frequencies, output_file, cache_dir=None, **options):
+    """Render one word cloud image from a {word: count} mapping.
+
+    Uses WordCloud.to_file (PIL) instead of pyplot, so it is safe from
+    worker threads and processes. With cache_dir an image rendered
+    before for the same frequencies and options is copied instead.
+    Returns output_file, or None if there was nothing to draw.
+    """
+    options = {**DEFAULT_OPTIONS, **options}
+    frequencies = {word: count for word, count in frequencies.items() if count > 0}
+    if not frequencies:
+        return None
+
+    cached = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cached = os.path.join(cache_dir, cache_key(frequencies, options) + ".png")
+        if os.path.exists(cached):
+            shutil.copyfile(cached, output_file)
+            return output_file
+
+    WordCloud(**options).generate_from_frequencies(frequencies).to_file(output_file)
+    if cached:
+        # Átmeneti fájlon keresztül, hogy párhuzamos írók ne hagyjanak félkész képet a gyorsítótárban
+        temp_file = f"{cached}.{os.getpid()}.tmp"
+        shutil.copyfile(output_file, temp_file)
+        os.replace(temp_file, cached)
+    return output_file
+
+
+def _render_job(job):
+    frequencies, output_file, cache_dir, options = job
+    try:
+        return render_wordcloud(frequencies, output_file, cache_dir, **options)
+    except Exception as e:
+        print(f"Error rendering {output_file}: {e}")
+        return None
+
+
+def render_wordclouds(jobs, cache_dir=None, workers=None, **options):
+    """Render many (frequencies, output_file) jobs in parallel worker processes."""
+    jobs = [(dict(frequencies), output_file, cache_dir, options) for frequencies, output_file in jobs]
+    if workers == 1 or len(jobs) < 2:
+        return [_render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=max(1, len(jobs) // 64)))
+
+
+def _safe_name(name):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))
+
+
+def render_wordclouds_from_dataframe(df, output_dir, text_column="Singularized", name_column="File_Name",
+                                     group_column=None, per_document=True, corpus=True,
+                                     cache_dir=None, workers=None, **options):
+    """Per-document, per-group and corpus-wide word clouds from a process_pdfs result table.
+
+    Per-document images are named doc_<row>_<file name>.png.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    document_frequencies = [frequencies_from_texts([text]) for text in df[text_column]]
+    jobs = []
+    if per_document:
+        # A sorszám az azonos nevű (más mappából származó) fájlokat is megkülönbözteti
+        for row, (name, frequencies) in enumerate(zip(df[name_column], document_frequencies)):
+            stem = _safe_name(os.path.splitext(os.path.basename(str(name)))[0])
+            jobs.append((frequencies, os.path.join(output_dir, f"doc_{row:05d}_{stem}.png")))
+    if group_column:
+        groups = {}
+        for group, frequencies in zip(df[group_column], document_frequencies):
+            groups.setdefault(group, Counter()).update(frequencies)
+        for group, frequencies in groups.items():
+            jobs.append((frequencies, os.path.join(output_dir, f"group_{_safe_name(group)}.png")))
+    if corpus:
+        total = Counter()
+        for frequencies in document_frequencies:
+            total.update(frequencies)
+        jobs.append((total, os.path.join(output_dir, "corpus.png")))
+    return render_wordclouds(jobs, cache_dir, workers, **options)